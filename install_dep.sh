@@ -17,6 +17,9 @@ pip install colorama
 #install jinja2
 pip install Jinja2
 
+#install scandir (optional backport of os.scandir for python 2)
+python -c 'import os; os.scandir' &> /dev/null || pip install scandir
+
 docker_dir=$CURR_DIR/docker_images
 mkdir -p $docker_dir
 function fetch(){
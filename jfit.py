@@ -7,12 +7,34 @@ import os
 import shlex
 import shutil
 import subprocess
-import time
-from distutils.dir_util import copy_tree
-from distutils.errors import DistutilsFileError
+import sys
+import tarfile
 
 import colorama
 import jinja2
+try:
+    from os import scandir
+except ImportError:
+    try:
+        # python 2 with the scandir backport
+        from scandir import scandir
+    except ImportError:
+        class _DirEntry(object):
+            '''
+            Minimal os.DirEntry stand-in for python 2 without the backport
+            '''
+            def __init__(self, dir_path, name):
+                self.name = name
+                self.path = os.path.join(dir_path, name)
+
+            def is_dir(self):
+                return os.path.isdir(self.path)
+
+            def is_file(self):
+                return os.path.isfile(self.path)
+
+        def scandir(dir_path):
+            return [_DirEntry(dir_path, x) for x in os.listdir(dir_path)]
 
 DEP_SCRIPT = 'install_dep.sh'
 DATA_DIR = 'data'
@@ -23,6 +45,7 @@ CONFIG_LOCATION = 'config'
 GROUP_DIR = os.path.join(ETC_DIR_PATH, 'core_output')
 COMPOSE_SNIPPET_DIR = os.path.join(FILE_DIR_PATH, 'compose_files')
 GROUP_ENV_FILE = 'source.env'
+COMPOSE_ARGV_FILE = '.compose_argv.json'
 SERVICE_KEYS = ['JTI_NATIVE_COLLECTOR',
                 'JTI_OC_COLLECTOR',
                 'RULE_ENGINE',
@@ -30,19 +53,43 @@ SERVICE_KEYS = ['JTI_NATIVE_COLLECTOR',
                 'COMMAND_RPC',
                 'DATABASE']
 DOCKER_IMAGE_DIR = os.path.join(FILE_DIR_PATH, 'docker_images')
+# template variables common to all groups
+# directory paths should be without '/' at the end
+_GLOBAL_TEMPLATE_VARS = {
+    'JFIT_ETC_PATH': ETC_DIR_PATH,
+    'JFIT_OUTPUT_PATH': GROUP_DIR
+}
 PARSE_INPUT_DIR = os.path.join(FILE_DIR_PATH, 'input')
+MAX_COMPOSE_WORKERS = 8
+MAX_IMAGE_LOAD_WORKERS = 4
+# echoed commands go to stderr, which may be redirected separately
+_USE_STDERR_COLOR = sys.stderr.isatty()
+# commands being executed are echoed from level 2 onwards
+try:
+    _VERBOSE = int(os.environ.get('JFIT_VERBOSE', '1'))
+except ValueError:
+    _VERBOSE = 1
+IMAGE_MANIFEST_FILE = 'manifest.json'
 
+# (image path, image mtime) -> repo tag
+_TAG_CACHE = {}
+# compose snippet directory -> jinja environment
+_JINJA_ENVS = {}
 
-def parse_args():
+
+def _add_install_parser(subparsers):
     '''
-    Argument parser for the script
+    Add the install sub-command parser
     '''
-    arg_parser = argparse.ArgumentParser()
-    subparsers = arg_parser.add_subparsers(help='sub-command help',
-                                           dest='commands')
-    install_parser = subparsers.add_parser(
+    subparsers.add_parser(
         'install',
         help='Install jFit')
+
+
+def _add_remove_parser(subparsers):
+    '''
+    Add the remove sub-command parser
+    '''
     remove_parser = subparsers.add_parser(
         'remove',
         help='Remove/Delete services')
@@ -52,6 +99,12 @@ def parse_args():
     remove_parser.add_argument("-s", "--service",
                                help="Name of the service to be removed",
                                type=str)
+
+
+def _add_parse_parser(subparsers):
+    '''
+    Add the parse sub-command parser
+    '''
     parse_parser = subparsers.add_parser('parse',
                                          help='Parse the input data model')
     parse_parser.add_argument('input_file_path',
@@ -60,6 +113,12 @@ def parse_args():
                               help='Device group name')
     parse_parser.add_argument('-i', '--input-dir',
                               help='Input directory location. Keep udf and iagent files here. Defaults to {}'.format(PARSE_INPUT_DIR))
+
+
+def _add_start_parser(subparsers):
+    '''
+    Add the start sub-command parser
+    '''
     start_parser = subparsers.add_parser(
         'start',
         help='Start the application for a group')
@@ -69,6 +128,12 @@ def parse_args():
     start_parser.add_argument("-s", "--service",
                               help="Name of service to be started. In the absence of this, all neccessary services would be started",
                               type=str)
+
+
+def _add_stop_parser(subparsers):
+    '''
+    Add the stop sub-command parser
+    '''
     stop_parser = subparsers.add_parser(
         'stop',
         help='Stop the application for a group')
@@ -78,6 +143,12 @@ def parse_args():
     stop_parser.add_argument("-s", "--service",
                              help="Name of service to be stopped. In the absence of this, all neccessary services would be stopped",
                              type=str)
+
+
+def _add_restart_parser(subparsers):
+    '''
+    Add the restart sub-command parser
+    '''
     restart_parser = subparsers.add_parser(
         'restart',
         help='Restart the application for a group')
@@ -87,6 +158,27 @@ def parse_args():
     restart_parser.add_argument("-s", "--service",
                                 help="Name of service to be restarted. In the absence of this, all neccessary services would be restarted",
                                 type=str)
+
+
+def _add_recreate_parser(subparsers):
+    '''
+    Add the recreate sub-command parser
+    '''
+    recreate_parser = subparsers.add_parser(
+        'recreate',
+        help='Recreate and start the containers of a group')
+    recreate_parser.add_argument("group_name",
+                                 help="Group name",
+                                 type=str)
+    recreate_parser.add_argument("-s", "--service",
+                                 help="Name of service to be recreated. In the absence of this, all neccessary services would be recreated",
+                                 type=str)
+
+
+def _add_cli_parser(subparsers):
+    '''
+    Add the cli sub-command parser
+    '''
     cli_parser = subparsers.add_parser(
         'cli',
         help='Gain cli access to a service')
@@ -96,6 +188,12 @@ def parse_args():
     cli_parser.add_argument("service",
                             help="Name of the service",
                             type=str)
+
+
+def _add_logs_parser(subparsers):
+    '''
+    Add the logs sub-command parser
+    '''
     logs_parser = subparsers.add_parser(
         'logs',
         help='Access service logs')
@@ -105,6 +203,12 @@ def parse_args():
     logs_parser.add_argument("service",
                              help="Name of the service",
                              type=str)
+
+
+def _add_mgd_parser(subparsers):
+    '''
+    Add the mgd sub-command parser
+    '''
     mgd_parser = subparsers.add_parser(
         'mgd',
         help='Spin up MGD container for writing rules'
@@ -113,19 +217,72 @@ def parse_args():
                             help='Command for container',
                             choices=['start', 'stop', 'cli'],
                             type=str)
+
+
+# sub-command name -> function adding its parser
+SUBPARSER_BUILDERS = [
+    ('install', _add_install_parser),
+    ('remove', _add_remove_parser),
+    ('parse', _add_parse_parser),
+    ('start', _add_start_parser),
+    ('stop', _add_stop_parser),
+    ('restart', _add_restart_parser),
+    ('recreate', _add_recreate_parser),
+    ('cli', _add_cli_parser),
+    ('logs', _add_logs_parser),
+    ('mgd', _add_mgd_parser),
+]
+
+
+def parse_args():
+    '''
+    Argument parser for the script
+    '''
+    arg_parser = argparse.ArgumentParser(
+        epilog='Set JFIT_VERBOSE=2 to echo the commands being executed')
+    subparsers = arg_parser.add_subparsers(help='sub-command help',
+                                           dest='commands')
+    # only the requested sub-command needs a parser. Help, missing or
+    # unknown sub-commands need all of them
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    builders = [builder
+                for name, builder in SUBPARSER_BUILDERS
+                if name == command]
+    if not builders:
+        builders = [builder for _, builder in SUBPARSER_BUILDERS]
+    for builder in builders:
+        builder(subparsers)
     args = arg_parser.parse_args()
     return args
 
 
-def execute(command_string, color=colorama.Fore.CYAN):
+def _echo_command(command_string, color):
+    '''
+    Write the command about to be executed to stderr when verbose
+    '''
+    if _VERBOSE >= 2:
+        if _USE_STDERR_COLOR:
+            command_string = color + command_string
+        sys.stderr.write(command_string + '\n')
+
+
+def execute(command, color=colorama.Fore.CYAN, cwd=None):
     '''
-    Execute the given command string
+    Execute the given command string or argument list, optionally
+    from the given working directory
     '''
-    args = shlex.split(command_string)
-    print(color+command_string)
+    if isinstance(command, (list, tuple)):
+        args = command
+        command_string = ' '.join(command)
+    else:
+        args = shlex.split(command)
+        command_string = command
+    _echo_command(command_string, color)
     try:
         output = subprocess.check_output(args,
-                                         stderr=subprocess.STDOUT)
+                                         stderr=subprocess.STDOUT,
+                                         universal_newlines=True,
+                                         cwd=cwd)
         output = output.strip()
     except subprocess.CalledProcessError as exc:
         err = "Command {0} exited with code: {1}".\
@@ -137,16 +294,23 @@ def execute(command_string, color=colorama.Fore.CYAN):
         return output
 
 
-def shell_command(command_string, color=colorama.Fore.CYAN):
+def shell_command(command, color=colorama.Fore.CYAN, cwd=None):
     '''
-    Execute command in shell mode
+    Execute the given command string or argument list attached to the
+    terminal, optionally from the given working directory, and return
+    its exit code
     '''
-    args = command_string
-    print(color+command_string)
+    if isinstance(command, (list, tuple)):
+        args = command
+        command_string = ' '.join(command)
+    else:
+        args = shlex.split(command)
+        command_string = command
+    _echo_command(command_string, color)
     try:
         output = subprocess.call(args,
-                                 shell=True,
-                                 stderr=subprocess.STDOUT)
+                                 stderr=subprocess.STDOUT,
+                                 cwd=cwd)
     except subprocess.CalledProcessError as exc:
         err = "Command {0} exited with code: {1}".\
             format(command_string, exc.returncode)
@@ -162,13 +326,11 @@ def get_docker_images(full_path=True):
     Search docker image directory and return their names or path
     depending on the argument
     '''
-    docker_images = [f
-                     for f in os.listdir(DOCKER_IMAGE_DIR)
-                     if f.startswith('jfit_') and
-                     f.endswith('.tar.gz')]
-    if full_path:
-        docker_images = [os.path.join(DOCKER_IMAGE_DIR, f)
-                         for f in docker_images]
+    docker_images = [f.path if full_path else f.name
+                     for f in scandir(DOCKER_IMAGE_DIR)
+                     if f.name.startswith('jfit_') and
+                     f.name.endswith('.tar.gz') and
+                     f.is_file()]
     return docker_images
 
 
@@ -179,19 +341,67 @@ def get_group_dir_path(group_name):
     return os.path.join(GROUP_DIR, group_name)
 
 
+def _json_loads(data):
+    '''
+    Decode JSON bytes, with orjson when it is available. It is imported
+    here as only a manifest cache miss needs it
+    '''
+    try:
+        from orjson import loads
+    except ImportError:
+        # python < 3.6 json does not accept bytes
+        return json.loads(data.decode('utf-8'))
+    return loads(data)
+
+
 def _get_container_tags(container_image_path):
-    cwd = os.getcwd()
-    os.chdir(FILE_DIR_PATH)
-    image_manifest_file = 'manifest.json'
-    untar_command = 'tar -xf {} {}'.format(container_image_path, image_manifest_file)
-    execute(untar_command)
-    image_manifest_file_path = os.path.join(FILE_DIR_PATH, image_manifest_file)
-    tags = json.load(open(image_manifest_file, 'r'))[0]['RepoTags'][0]
-    os.remove(image_manifest_file_path)
-    os.chdir(cwd)
+    '''
+    Return the first repo tag of a saved docker image. Results are
+    cached per image path and modification time
+    '''
+    try:
+        cache_key = (container_image_path,
+                     os.path.getmtime(container_image_path))
+    except OSError:
+        err = 'Unable to find docker image: {}'.format(container_image_path)
+        print(colorama.Fore.RED + err)
+        return None
+    if cache_key in _TAG_CACHE:
+        return _TAG_CACHE[cache_key]
+    try:
+        with tarfile.open(container_image_path) as tar_fob:
+            # members are read lazily, stop at the manifest instead of
+            # indexing (and decompressing) the whole archive
+            for member in tar_fob:
+                if member.name == IMAGE_MANIFEST_FILE:
+                    manifest = _json_loads(
+                        tar_fob.extractfile(member).read())
+                    break
+            else:
+                raise KeyError('{} not found'.format(IMAGE_MANIFEST_FILE))
+        tags = manifest[0]['RepoTags'][0]
+    except (tarfile.TarError, KeyError, IndexError, ValueError) as exc:
+        err = 'Unable to read {} from {}: {}'.format(
+            IMAGE_MANIFEST_FILE, container_image_path, exc)
+        print(colorama.Fore.RED + err)
+        return None
+    _TAG_CACHE[cache_key] = tags
     return tags
 
 
+def _get_jinja_env(compose_snippet_loc):
+    '''
+    Return a jinja environment loading templates from the given directory.
+    Compiled templates are cached by the environment
+    '''
+    if compose_snippet_loc not in _JINJA_ENVS:
+        _JINJA_ENVS[compose_snippet_loc] = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(compose_snippet_loc),
+            autoescape=False,
+            cache_size=-1)
+    return _JINJA_ENVS[compose_snippet_loc]
+
+
 def _create_compose_file(dir_path, compose_snippet_loc=COMPOSE_SNIPPET_DIR):
     # collect service names
     env_file = os.path.join(dir_path, GROUP_ENV_FILE)
@@ -201,19 +411,15 @@ def _create_compose_file(dir_path, compose_snippet_loc=COMPOSE_SNIPPET_DIR):
     with open(env_file, 'r') as fob:
         env_file_content = fob.read()
     # parse env contents
-    env_dict = {line.split('=')[0]: line.split('=')[1]
-                for line in env_file_content.split()
-                if line.strip()}
-    for key in env_dict:
-        if key.endswith('_LIST'):
-            val = env_dict[key][1:-1]
-            val = val.split(",")
-            env_dict[key] = val
-    # directory paths should be without '/' at the end
-    env_dict.update({
-        'JFIT_ETC_PATH': ETC_DIR_PATH,
-        'JFIT_OUTPUT_PATH': GROUP_DIR
-    })
+    env_dict = dict(line.split('=', 1)
+                    for line in env_file_content.split()
+                    if '=' in line)
+    # list values are of the form [a,b,c]
+    env_dict = {key: (val[1:-1].split(',') if key.endswith('_LIST') else val)
+                for key, val in env_dict.items()}
+    env_dict.update(_GLOBAL_TEMPLATE_VARS)
+    jinja_env = _get_jinja_env(compose_snippet_loc)
+    compose_files = []
     ret_code = 0
     for service_type in env_dict:
         if service_type not in SERVICE_KEYS:
@@ -240,10 +446,7 @@ def _create_compose_file(dir_path, compose_snippet_loc=COMPOSE_SNIPPET_DIR):
             err = 'Compose file {} is missing'.format(jinja_template)
             ret_code = 1
             break
-        template = None
-        with open(jinja_template, 'r') as fob:
-            template = fob.read()
-        if not template:
+        if not os.path.getsize(jinja_template):
             err = 'Compose file {} is empty'.format(jinja_template)
             ret_code = 1
             break
@@ -258,42 +461,90 @@ def _create_compose_file(dir_path, compose_snippet_loc=COMPOSE_SNIPPET_DIR):
         if os.path.isfile(conf_file_path):
             data['{}_CONF'.format(service.upper())] = conf_file_path
         data.update(env_dict)
-        output = jinja2.Template(template).render(env=data)
+        template = jinja_env.get_template(os.path.basename(jinja_template))
+        output = template.render(env=data)
         # place them inside the group directory
-        rendered_compose_location = os.path.join(dir_path,
-                                                 '{}.yaml'.format(service))
+        compose_file = '{}.yaml'.format(service)
+        rendered_compose_location = os.path.join(dir_path, compose_file)
         with open(rendered_compose_location, 'w') as fob:
             fob.write(output)
+        compose_files.append(compose_file)
 
     if ret_code != 0:
         print(colorama.Fore.RED + err)
+        return ret_code
+    if not compose_files:
+        # nothing to record, later commands report the missing files
+        return ret_code
+    # record the compose arguments so that later commands need not
+    # rebuild them
+    group_name = os.path.basename(os.path.normpath(dir_path))
+    with open(os.path.join(dir_path, COMPOSE_ARGV_FILE), 'w') as fob:
+        json.dump(_compose_base(group_name, compose_files), fob)
     return ret_code
 
 
 def _get_compose_files(dir_path):
-    yaml_files = [x
-                  for x in os.listdir(dir_path)
-                  if x.endswith('.yaml')]
+    yaml_files = [x.name
+                  for x in scandir(dir_path)
+                  if x.name.endswith('.yaml') and
+                  x.is_file()]
     if not yaml_files:
         err = 'Unable to find compose files.\n Please run parse command first!'
         print(colorama.Fore.RED + err)
         return 1
-    # for appending -f at the beginning of the first file add an empty element
-    return ' -f '.join(['']+yaml_files)
+    return yaml_files
+
+
+def _compose_base(group_name, compose_files):
+    '''
+    Return the docker-compose argument list common to all
+    commands of a group
+    '''
+    compose_args = ['docker-compose', '-p', group_name]
+    for compose_file in compose_files:
+        compose_args.extend(['-f', compose_file])
+    return compose_args
+
+
+def _load_compose_base(group_name, group_dir_path):
+    '''
+    Return the docker-compose argument list recorded for the group by
+    parse. Groups without a record fall back to a directory scan
+    '''
+    try:
+        with open(os.path.join(group_dir_path, COMPOSE_ARGV_FILE), 'r') as fob:
+            return json.load(fob)
+    except (IOError, ValueError):
+        compose_files = _get_compose_files(group_dir_path)
+        if compose_files == 1:
+            return 1
+        return _compose_base(group_name, compose_files)
+
+
+def _load_docker_image(docker_image):
+    '''
+    Load a saved docker image and return the exit code of the load
+    '''
+    docker_load_cmd = ['sudo', 'docker', 'load', '--input', docker_image]
+    try:
+        execute(docker_load_cmd)
+    except subprocess.CalledProcessError as exc:
+        return exc.returncode
+    message = 'Successfully loaded {}'.format(docker_image)
+    print(colorama.Fore.GREEN + message)
+    return 0
 
 
 def install(args):
     '''
     Function to install jFit
     '''
-    cwd = os.getcwd()
-
     # first install dependencies
-    os.chdir(FILE_DIR_PATH)
-    dep_install_command = 'bash {}'.format(DEP_SCRIPT)
+    dep_install_command = ['bash', DEP_SCRIPT]
     ret_code = 0
     try:
-        execute(dep_install_command)
+        execute(dep_install_command, cwd=FILE_DIR_PATH)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
 
@@ -304,28 +555,36 @@ def install(args):
 
     message = 'Success: Dependency install'
     print(colorama.Fore.GREEN + message)
-    os.chdir(cwd)
 
     # Load the docker images
     docker_images = get_docker_images()
     if docker_images:
-        docker_load_cmd = 'sudo docker load --input {}'
-        for docker_image in docker_images:
-            try:
-                execute(docker_load_cmd.format(docker_image))
-            except subprocess.CalledProcessError as exc:
-                ret_code = exc.returncode
-                break
-            else:
-                message = 'Successfully loaded {}'.format(docker_image)
-                print(colorama.Fore.GREEN + message)
+        # cache sudo credentials first so that the concurrent loads
+        # do not all prompt for the password at once
+        try:
+            execute(['sudo', '-v'])
+        except subprocess.CalledProcessError as exc:
+            ret_code = exc.returncode
+    if docker_images and ret_code == 0:
+        # images are independent, decompress and load them concurrently
+        # imported here to keep it off the start-up path of other commands
+        from multiprocessing.pool import ThreadPool
+        pool = ThreadPool(min(MAX_IMAGE_LOAD_WORKERS, len(docker_images)))
+        try:
+            ret_codes = pool.map(_load_docker_image, docker_images)
+        finally:
+            pool.close()
+            pool.join()
+        non_zero = [x for x in ret_codes if x != 0]
+        if non_zero:
+            ret_code = non_zero[0]
     if ret_code != 0:
         message = 'Failure: Docker image load'
         print(colorama.Fore.RED + message)
         return ret_code
 
     # make soft link
-    command = 'ln -sf {} {}'.format(os.path.realpath(__file__), '/usr/local/bin/jfit')
+    command = ['ln', '-sf', os.path.realpath(__file__), '/usr/local/bin/jfit']
     try:
         execute(command)
     except subprocess.CalledProcessError as exc:
@@ -341,28 +600,31 @@ def remove(args):
     '''
     Remove application
     '''
-    cwd = os.getcwd()
     group_name = args.group_name
     group_dir_path = get_group_dir_path(group_name)
-    os.chdir(group_dir_path)
-    compose_files = _get_compose_files(group_dir_path)
-    compose_command = \
-        'docker-compose -p {} {} rm --force --stop -v'.\
-        format(group_name, compose_files)
+    # check if group name is valid
+    if not os.path.isdir(group_dir_path):
+        err = 'Group name is not valid'
+        print(colorama.Fore.RED + err)
+        return 1
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
+        return 1
+    compose_command = compose_base + \
+        ['rm', '--force', '--stop', '-v']
     message = 'Remove group {}'.format(group_name)
     if args.service:
-        compose_command = '{} {}'.format(compose_command, args.service)
+        compose_command.append(args.service)
         message = colorama.Fore.GREEN +\
             'Remove {}\'s service {}'.format(group_name, args.service)
     ret_code = 0
     try:
-        execute(compose_command)
+        execute(compose_command, cwd=group_dir_path)
         message = colorama.Fore.GREEN + 'Success: {}'.format(message)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
         message = colorama.Fore.RED + 'Failure: {}'.format(message)
     print(message)
-    os.chdir(cwd)
     return ret_code
 
 
@@ -400,43 +662,53 @@ def parse(args):
         DOCKER_IMAGE_DIR,
         jfit_core_container_name+'.tar.gz')
     tags = _get_container_tags(jfit_core_image_path)
+    if tags is None:
+        return 1
     # below output directory is different than mount point
     # because jfit-core clears the output dir supplied.
     # As you can't delete the mount point, we make another directory
     # inside the mount point and clear it.
-    parse_command = 'python /jfit/jfit.py \
-                    --config /input.json\
-                    --device-group {}\
-                    --output-dir /output/core_output\
-                    --data-base-path /input\
-                    '.format(
-                        args.device_group,
-                    )
+    parse_command = ['python', '/jfit/jfit.py',
+                     '--config', '/input.json',
+                     '--device-group', args.device_group,
+                     '--output-dir', '/output/core_output',
+                     '--data-base-path', '/input']
     output_mount = os.path.realpath(os.path.join(output_folder, '..'))
-    docker_parse_command = 'docker run -i -d \
-                            -v {}:/input.json \
-                            -v {}:/output/ \
-                            -v {}:/input/ \
-                            {} {}'.format(
-                                input_file_path,
-                                output_mount,
-                                input_dir,
-                                tags,
-                                parse_command)
+    docker_parse_command = ['docker', 'run', '-i', '-d',
+                            '-v', '{}:/input.json'.format(input_file_path),
+                            '-v', '{}:/output/'.format(output_mount),
+                            '-v', '{}:/input/'.format(input_dir),
+                            tags] + parse_command
     ret_code = 0
+    container_id = None
     try:
-        container_id = execute(docker_parse_command)
-        status_command = 'docker inspect --format="{{{}}}" {}'.\
-            format('{.State.Status}', container_id)
-        status = ''
-        while status != 'exited':
-            status = execute(status_command)
-            time.sleep(5)
-        remove_command = 'docker rm -f {}'.format(container_id)
-        execute(remove_command)
+        run_output = execute(docker_parse_command)
+        # docker warnings share the output, the container id comes last
+        container_id = run_output.splitlines()[-1]
+        # blocks until the container exits and prints its exit code
+        wait_command = ['docker', 'wait', container_id]
+        wait_output = execute(wait_command)
+        try:
+            # the exit code comes last as well
+            ret_code = int(wait_output.splitlines()[-1])
+        except (IndexError, ValueError):
+            message = 'Unable to read exit code of {} from: {}'.format(
+                jfit_core_container_name, wait_output)
+            print(colorama.Fore.RED + message)
+            ret_code = 1
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
+    finally:
+        if container_id is not None:
+            remove_command = ['docker', 'rm', '-f', container_id]
+            try:
+                execute(remove_command)
+            except subprocess.CalledProcessError as exc:
+                ret_code = ret_code or exc.returncode
     if ret_code != 0:
+        message = 'Failure: {} exited with code {}'.format(
+            jfit_core_container_name, ret_code)
+        print(colorama.Fore.RED + message)
         return ret_code
 
     # now go to the output folder and construct their compose files
@@ -444,15 +716,23 @@ def parse(args):
         message = 'Unable to parse input configuration'
         print(colorama.Fore.RED + message)
         return 1
-    group_folders = [os.path.join(output_folder, x)
-                     for x in os.listdir(output_folder)
-                     if not x.startswith('.') and
-                     os.path.isdir(os.path.join(output_folder, x))]
+    group_folders = [x.path
+                     for x in scandir(output_folder)
+                     if not x.name.startswith('.') and
+                     x.is_dir()]
     if not group_folders:
         message = 'Unable to parse the input configuration'
         print(colorama.Fore.RED + message)
         return 1
-    ret_codes = [_create_compose_file(x) for x in group_folders]
+    # groups are independent of each other, render them concurrently
+    # imported here to keep it off the start-up path of other commands
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(min(MAX_COMPOSE_WORKERS, len(group_folders)))
+    try:
+        ret_codes = pool.map(_create_compose_file, group_folders)
+    finally:
+        pool.close()
+        pool.join()
     non_zero = [x for x in ret_codes if x != 0]
     if non_zero:
         ret_code = 1
@@ -472,24 +752,19 @@ def start(args):
         return 1
     ret_code = 0
     message = colorama.Fore.GREEN + 'Success!'
-    cwd = os.getcwd()
-    os.chdir(group_dir_path)
-    compose_command = 'docker-compose -p {}'.format(group_name)
-    compose_files = _get_compose_files(group_dir_path)
-    if compose_files == 1:
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
         return 1
-    compose_command = '{} {}'.format(compose_command, compose_files)
     if args.service:
-        compose_command = '{} start {}'.format(compose_command, args.service)
+        compose_command = compose_base + ['start', args.service]
     else:
-        compose_command = '{} up -d'.format(compose_command)
+        compose_command = compose_base + ['up', '-d']
     try:
-        output = execute(compose_command)
+        output = execute(compose_command, cwd=group_dir_path)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
     else:
         print(output)
-    os.chdir(cwd)
     if ret_code == 0:
         print(message)
     return ret_code
@@ -508,22 +783,18 @@ def stop(args):
         return 1
     ret_code = 0
     message = colorama.Fore.GREEN + 'Success!'
-    cwd = os.getcwd()
-    os.chdir(group_dir_path)
-    compose_files = _get_compose_files(group_dir_path)
-    if compose_files == 1:
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
         return 1
-    compose_command = 'docker-compose -p {} {} stop'.\
-        format(group_name, compose_files)
+    compose_command = compose_base + ['stop']
     if args.service:
-        compose_command = '{} {}'.format(compose_command, args.service)
+        compose_command.append(args.service)
     try:
-        output = execute(compose_command)
+        output = execute(compose_command, cwd=group_dir_path)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
     else:
         print(output)
-    os.chdir(cwd)
     if ret_code == 0:
         print(message)
     return ret_code
@@ -542,22 +813,49 @@ def restart(args):
         return 1
     ret_code = 0
     message = colorama.Fore.GREEN + 'Success!'
-    cwd = os.getcwd()
-    os.chdir(group_dir_path)
-    compose_files = _get_compose_files(group_dir_path)
-    if compose_files == 1:
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
+        return 1
+    compose_command = compose_base + ['restart']
+    if args.service:
+        compose_command.append(args.service)
+    try:
+        output = execute(compose_command, cwd=group_dir_path)
+    except subprocess.CalledProcessError as exc:
+        ret_code = exc.returncode
+    else:
+        print(output)
+    if ret_code == 0:
+        print(message)
+    return ret_code
+
+
+def recreate(args):
+    '''
+    Recreate application or a service in a single compose call
+    '''
+    group_name = args.group_name
+    group_dir_path = get_group_dir_path(group_name)
+    # check if group name is valid
+    if not os.path.isdir(group_dir_path):
+        err = 'Group name is not valid'
+        print(colorama.Fore.RED + err)
         return 1
-    compose_command = 'docker-compose -p {} {} restart'.\
-        format(group_name, compose_files)
+    ret_code = 0
+    message = colorama.Fore.GREEN + 'Success!'
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
+        return 1
+    compose_command = compose_base + \
+        ['up', '-d', '--force-recreate']
     if args.service:
-        compose_command = '{} {}'.format(compose_command, args.service)
+        compose_command.append(args.service)
     try:
-        output = execute(compose_command)
+        output = execute(compose_command, cwd=group_dir_path)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
     else:
         print(output)
-    os.chdir(cwd)
     if ret_code == 0:
         print(message)
     return ret_code
@@ -575,18 +873,15 @@ def cli(args):
         print(colorama.Fore.RED + err)
         return 1
     ret_code = 0
-    cwd = os.getcwd()
-    os.chdir(group_dir_path)
-    compose_files = _get_compose_files(group_dir_path)
-    if compose_files == 1:
+    compose_base = _load_compose_base(group_name, group_dir_path)
+    if compose_base == 1:
         return 1
-    compose_command = 'docker-compose -p {} {} exec {} sh'.\
-        format(group_name, compose_files, args.service)
+    compose_command = compose_base + \
+        ['exec', args.service, 'sh']
     try:
-        ret_code = shell_command(compose_command)
+        ret_code = shell_command(compose_command, cwd=group_dir_path)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
-    os.chdir(cwd)
     return ret_code
 
 
@@ -602,21 +897,18 @@ def logs(args):
         print(colorama.Fore.RED + err)
         return 1
     ret_code = 0
-    cwd = os.getcwd()
-    os.chdir(group_dir_path)
-    inspect_command = 'docker inspect --format="{{{}}}" {}_{}_1'.\
-        format('{.LogPath}', group_name.lower(), args.service)
+    inspect_command = ['docker', 'inspect', '--format={{.LogPath}}',
+                       '{}_{}_1'.format(group_name.lower(), args.service)]
     try:
         log_location = execute(inspect_command)
     except subprocess.CalledProcessError as exc:
         ret_code = exc.returncode
     else:
-        vi_command = 'vi {}'.format(log_location)
+        vi_command = ['vi', log_location]
         try:
             shell_command(vi_command)
         except subprocess.CalledProcessError as exc:
             ret_code = exc.returncode
-    os.chdir(cwd)
     return ret_code
 
 
@@ -628,7 +920,7 @@ def mgd(args):
     mgd_container_name = 'jfit_mgd_cli'
     if command == 'start':
         try:
-            remove_command = 'docker rm -f {}'.format(mgd_container_name)
+            remove_command = ['docker', 'rm', '-f', mgd_container_name]
             execute(remove_command)
             message = 'Removed already running container! Starting a new one'
             print(colorama.Fore.MAGENTA + message)
@@ -636,22 +928,23 @@ def mgd(args):
             pass
         mgd_docker_image = os.path.join(DOCKER_IMAGE_DIR, MGD_IMAGE)
         tags = _get_container_tags(mgd_docker_image)
+        if tags is None:
+            return 1
         config_folder_location = os.path.join(
             FILE_DIR_PATH, CONFIG_LOCATION, '')
-        docker_command = 'docker run -v {}:/config/ --name {} -d {}'.format(
-            config_folder_location,
-            mgd_container_name,
-            tags
-        )
+        docker_command = ['docker', 'run',
+                          '-v', '{}:/config/'.format(config_folder_location),
+                          '--name', mgd_container_name,
+                          '-d', tags]
         execute(docker_command)
         args.mgd_command = 'cli'
         mgd(args)
     elif command == 'stop':
-        docker_command = 'docker stop {}'.format(mgd_container_name)
+        docker_command = ['docker', 'stop', mgd_container_name]
         execute(docker_command)
     elif command == 'cli':
-        docker_command = 'docker exec -it {} /usr/sbin/cli'\
-            .format(mgd_container_name)
+        docker_command = ['docker', 'exec', '-it', mgd_container_name,
+                          '/usr/sbin/cli']
         shell_command(docker_command)
 
 